@@ -1,6 +1,6 @@
 use cpython::{
     exc::TypeError, py_class, py_exception, py_module_initializer, ObjectProtocol, PyClone, PyDrop,
-    PyErr, PyObject, PyResult, PySequence, PythonObject,
+    PyErr, PyObject, PyResult, PySequence, PyTuple, PythonObject,
 };
 use search::Graph;
 use std::cell::RefCell;
@@ -121,6 +121,34 @@ py_class!(class Conversions |py| {
         Ok(py.None())
     }
 
+    /// Add a number of conversions in one go. Equivalent to calling "add_conversion"
+    /// for each of them, but cheaper when registering many conversions at once.
+    ///
+    /// Args:
+    ///     conversions (Iterable[Tuple[int, Type[A], Sequence[Hashable], Type[B], Sequence[Hashable], Callable[[A], B]]]):
+    ///         Tuples matching the arguments of "add_conversion".
+    ///         eg: (cost, type_in, variations_in, type_out, variations_out, function)
+    def add_conversions_bulk(&self, conversions: &PyObject) -> PyResult<PyObject> {
+        let mut edges = Vec::new();
+        let mut functions = Vec::new();
+        for conversion in conversions.iter(py)? {
+            let (cost, type_in, variations_in, type_out, variations_out, function): (
+                i32, PyObject, PySequence, PyObject, PySequence, PyObject
+            ) = conversion?.extract(py)?;
+            let hash_func = function.hash(py)?;
+            let hash_var_in: BTreeSet<Int> = hash_seq!(py, variations_in);
+            let hash_var_out: BTreeSet<Int> = hash_seq!(py, variations_out);
+            edges.push((
+                cost, type_in.hash(py)?, hash_var_in, type_out.hash(py)?, hash_var_out, hash_func,
+            ));
+            functions.push((hash_func, function));
+        }
+
+        self.functions(py).borrow_mut().extend(functions);
+        self.graph(py).borrow_mut().add_edges(edges);
+        Ok(py.None())
+    }
+
     /// Supply a function that will attempt to reveal insights into the provided data as variations.
     /// This is a convenience aid, to assist in detecting input variations automatically so they do not
     /// need to be expicitly specified.
@@ -190,8 +218,8 @@ py_class!(class Conversions |py| {
             None => BTreeSet::new(),
         };
 
-        // Short circut if we are just looking at the same thing
-        if hash_in == hash_out && hash_var_in == hash_var_out {
+        // Short circut if we already have what we want
+        if hash_in == hash_out && hash_var_out.is_subset(&hash_var_in) {
             return Ok(value)
         }
 
@@ -264,6 +292,78 @@ py_class!(class Conversions |py| {
         }
     }
 
+    /// Find the chain of functions that would convert one type into another, without running them.
+    /// This is the same search "convert" makes, but done ahead of time, so without a value.
+    ///
+    /// Should a step fail, "convert" would go on to try other routes. So if there are any,
+    /// the chain that ends up being used depends on the value, and None is returned.
+    /// A chain returned here is the only way to make the conversion.
+    ///
+    /// Args:
+    ///     type_have (Type[A]): The type to start from.
+    ///     type_want (Type[B]): The type to finish with.
+    ///     variations_want (Sequence[Hashable]): As with "convert".
+    ///     variations_have (Sequence[Hashable]): As with "convert".
+    ///     explicit (bool):
+    ///         Revealers inspect the value itself, so if any are registered for "type_have"
+    ///         the chain cannot be known ahead of time, and None is returned. Enable this
+    ///         to ignore revealers and resolve with precisely the variations provided.
+    /// Returns:
+    ///     Optional[Tuple[Callable, ...]]: Functions to call in order, passing the result of each to the next.
+    def resolve(
+        &self,
+        type_have: &PyObject,
+        type_want: &PyObject,
+        variations_want: Option<&PySequence> = None,
+        variations_have: Option<&PySequence> = None,
+        explicit: bool = false,
+    ) -> PyResult<PyObject> {
+        let hash_in = type_have.hash(py)?;
+        let hash_out = type_want.hash(py)?;
+        let hash_var_out = match variations_want {
+            Some(vars) => hash_seq!(py, vars),
+            None => BTreeSet::new(),
+        };
+        let hash_var_in = match variations_have {
+            Some(vars) => hash_seq!(py, vars),
+            None => BTreeSet::new(),
+        };
+
+        if !explicit && self.revealers(py).borrow().contains_key(&hash_in) {
+            return Ok(py.None())
+        }
+
+        // Nothing to do if we already have what we want
+        if hash_in == hash_out && hash_var_out.is_subset(&hash_var_in) {
+            return Ok(PyTuple::empty(py).into_object())
+        }
+
+        let graph = self.graph(py).borrow();
+        match graph.search(hash_in, &hash_var_in, hash_out, &hash_var_out, &BTreeSet::new()) {
+            Some(edges) => {
+                // Check for other routes, were any one step to fail
+                for edge in &edges {
+                    let mut skip_edges = BTreeSet::new();
+                    skip_edges.insert(edge.clone());
+                    if graph.search(hash_in, &hash_var_in, hash_out, &hash_var_out, &skip_edges).is_some() {
+                        return Ok(py.None())
+                    }
+                }
+                let functions = self.functions(py).borrow();
+                let chain: Vec<PyObject> = edges
+                    .iter()
+                    .map(|edge| functions.get(&edge.data).expect("Function is there").clone_ref(py))
+                    .collect();
+                Ok(PyTuple::new(py, &chain).into_object())
+            },
+            None => Err(PyErr::new::<TypeError, _>(
+                py, format!(
+                    "Could not convert {} to {}. Perhaps some conversion steps are missing.",
+                    type_have, type_want
+                ))),
+        }
+    }
+
     ///////////////////////////////////////////////////////////////
     // Satisfy python garbage collector
     // because we hold a reference to some functions provided
@@ -1,3 +1,4 @@
+use std::cell::RefCell;
 use std::cmp::Reverse;
 use std::collections::hash_map::DefaultHasher;
 use std::collections::{BTreeSet, BinaryHeap, HashMap, HashSet};
@@ -38,6 +39,11 @@ pub struct Edge<K, V, D> {
 type AEdge<K, V, D> = Arc<Edge<K, V, D>>;
 type Edges<K, V, D> = HashMap<K, HashSet<AEdge<K, V, D>>>;
 type EdgeSet<K, V, D> = BTreeSet<AEdge<K, V, D>>;
+type Path<K, V, D> = Vec<AEdge<K, V, D>>;
+type PathKey<K, V> = (K, Variations<V>, K, Variations<V>);
+
+/// Upper bound on the number of remembered search results before the cache is flushed.
+const PATH_CACHE_SIZE: usize = 1024;
 
 #[derive(Hash, Eq, PartialEq, Debug, Ord, PartialOrd)]
 pub struct State<'a, K, V, D> {
@@ -82,6 +88,11 @@ struct Searcher<'a, K, V, D> {
 pub struct Graph<K, V, D> {
     edges_in: Edges<K, V, D>,
     edges_out: Edges<K, V, D>,
+
+    // Results of previous searches. The same conversions tend to be requested
+    // over and over, so skip the search entirely when we can.
+    // Flushed whenever the shape of the graph changes.
+    paths: RefCell<HashMap<PathKey<K, V>, Option<Path<K, V, D>>>>,
 }
 
 impl<'a, K: Key, V: Variant, D: Data> State<'a, K, V, D> {
@@ -412,6 +423,7 @@ impl<K: Key, V: Variant, D: Data> Graph<K, V, D> {
         Graph {
             edges_in: HashMap::new(),
             edges_out: HashMap::new(),
+            paths: RefCell::new(HashMap::new()),
         }
     }
 
@@ -424,6 +436,32 @@ impl<K: Key, V: Variant, D: Data> Graph<K, V, D> {
         key_out: K,
         variations_out: Variations<V>,
         data: D,
+    ) {
+        self.insert_edge(cost, key_in, variations_in, key_out, variations_out, data);
+
+        // New edges could open up cheaper paths
+        self.paths.borrow_mut().clear();
+    }
+
+    // Add a batch of edges to the graph, only touching the cache once
+    pub fn add_edges<I>(&mut self, edges: I)
+    where
+        I: IntoIterator<Item = (Cost, K, Variations<V>, K, Variations<V>, D)>,
+    {
+        for (cost, key_in, variations_in, key_out, variations_out, data) in edges {
+            self.insert_edge(cost, key_in, variations_in, key_out, variations_out, data);
+        }
+        self.paths.borrow_mut().clear();
+    }
+
+    fn insert_edge(
+        &mut self,
+        cost: Cost,
+        key_in: K,
+        variations_in: Variations<V>,
+        key_out: K,
+        variations_out: Variations<V>,
+        data: D,
     ) {
         let edge_arc = Arc::new(Edge {
             cost,
@@ -447,6 +485,34 @@ impl<K: Key, V: Variant, D: Data> Graph<K, V, D> {
         key_out: K,
         variations_out: &Variations<V>,
         skip_edges: &EdgeSet<K, V, D>,
+    ) -> Option<Vec<AEdge<K, V, D>>> {
+        // Only remember clean searches. Searches skipping edges are retries
+        // after a failure, and are specific to that one conversion.
+        if !skip_edges.is_empty() {
+            return self.search_uncached(key_in, variations_in, key_out, variations_out, skip_edges);
+        }
+
+        let path_key = (key_in, variations_in.clone(), key_out, variations_out.clone());
+        if let Some(path) = self.paths.borrow().get(&path_key) {
+            return path.clone();
+        }
+
+        let path = self.search_uncached(key_in, variations_in, key_out, variations_out, skip_edges);
+        let mut paths = self.paths.borrow_mut();
+        if paths.len() >= PATH_CACHE_SIZE {
+            paths.clear();
+        }
+        paths.insert(path_key, path.clone());
+        path
+    }
+
+    fn search_uncached(
+        &self,
+        key_in: K,
+        variations_in: &Variations<V>,
+        key_out: K,
+        variations_out: &Variations<V>,
+        skip_edges: &EdgeSet<K, V, D>,
     ) -> Option<Vec<AEdge<K, V, D>>> {
         let mut searcher = Searcher::new(
             key_in,
@@ -823,4 +889,50 @@ mod test {
         assert_eq!(result[0].data, 2);
         assert_eq!(result[1].data, 4);
     }
+
+    #[test]
+    fn test_search_cached() {
+        let graph = _graph!((1, 1, {}, 2, {}, 1), (1, 2, {}, 3, {}, 2));
+        let skip_null = BTreeSet::new();
+        let first = graph.search(1, &_set!(), 3, &_set!(), &skip_null).unwrap();
+        let second = graph.search(1, &_set!(), 3, &_set!(), &skip_null).unwrap();
+        assert_eq!(first, second);
+        assert_eq!(graph.paths.borrow().len(), 1);
+    }
+
+    #[test]
+    fn test_search_cache_cleared() {
+        let mut graph = _graph!((3, 1, {}, 2, {}, 1), (3, 2, {}, 3, {}, 2));
+        let skip_null = BTreeSet::new();
+        let result = graph.search(1, &_set!(), 3, &_set!(), &skip_null).unwrap();
+        assert_eq!(result.len(), 2);
+
+        graph.add_edge(1, 1, _set!(), 3, _set!(), 3);
+        assert_eq!(graph.paths.borrow().len(), 0);
+        let result = graph.search(1, &_set!(), 3, &_set!(), &skip_null).unwrap();
+        assert_eq!(result[0].data, 3);
+    }
+
+    #[test]
+    fn test_add_edges() {
+        let mut graph: Graph<u64, u64, u64> = Graph::new();
+        graph.add_edges(vec![
+            (1, 1, _set!(), 2, _set!(), 1),
+            (1, 2, _set!(), 3, _set!(), 2),
+        ]);
+        let result = graph.search(1, &_set!(), 3, &_set!(), &BTreeSet::new()).unwrap();
+        assert_eq!(result[0].data, 1);
+        assert_eq!(result[1].data, 2);
+    }
+
+    #[test]
+    fn test_search_skip_not_cached() {
+        let graph = _graph!((1, 1, {}, 2, {}, 1), (2, 1, {}, 2, {}, 2));
+        let first = graph.search(1, &_set!(), 2, &_set!(), &BTreeSet::new()).unwrap();
+        let mut skip = BTreeSet::new();
+        skip.insert(Arc::clone(&first[0]));
+        let result = graph.search(1, &_set!(), 2, &_set!(), &skip).unwrap();
+        assert_eq!(result[0].data, 2);
+        assert_eq!(graph.paths.borrow().len(), 1);
+    }
 }
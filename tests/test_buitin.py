@@ -1,6 +1,6 @@
 import unittest
 
-from to import to, shield
+from to import to, shield, add_conversion, ConversionError
 
 
 class TestBasics(unittest.TestCase):
@@ -16,6 +16,21 @@ class TestBasics(unittest.TestCase):
         self.assertEqual(to(123, bool), True)
         self.assertEqual(to("", bool), False)
 
+    def test_arguments(self):
+        self.assertEqual(to("123", type_want=int), 123)
+        self.assertEqual(to(123, str, None, int, None, True), "123")
+        self.assertEqual(
+            to(
+                "1",
+                float,
+                variations_want=(),
+                type_have=str,
+                variations_have=(),
+                explicit=False,
+            ),
+            1.0,
+        )
+
 class TestShield(unittest.TestCase):
 
     def test_int(self):
@@ -36,3 +51,69 @@ class TestShield(unittest.TestCase):
 
         self.assertEqual(test(True, False), (True, False))
         self.assertEqual(test("", "yep"), (False, True))
+
+    def test_partial_args(self):
+
+        @shield(int, int)
+        def test(num1, num2=None, flag=False):
+            return num1, num2, flag
+
+        self.assertEqual(test("1", "2"), (1, 2, False))
+        self.assertEqual(test("1"), (1, None, False))
+        self.assertEqual(test("1", flag=True), (1, None, True))
+
+    def test_new_conversion(self):
+
+        class Custom(object):
+            pass
+
+        @shield(str)
+        def test(value):
+            return value
+
+        with self.assertRaises(TypeError):
+            test(Custom())
+
+        add_conversion(1, Custom, (), str, (), lambda _: "custom")
+        self.assertEqual(test(Custom()), "custom")
+
+    def test_failure_called_once(self):
+
+        class Source(object):
+            pass
+
+        class Middle(object):
+            pass
+
+        class Target(object):
+            pass
+
+        calls = []
+
+        def fail(_):
+            calls.append("fail")
+            raise ValueError("nope")
+
+        @shield(Target)
+        def test(value):
+            return value
+
+        add_conversion(1, Source, (), Target, (), fail)
+        with self.assertRaises(ConversionError):
+            test(Source())
+        self.assertEqual(calls, ["fail"])
+
+        # With somewhere else to go
+        add_conversion(1, Source, (), Middle, (), lambda _: Middle())
+        add_conversion(1, Middle, (), Target, (), lambda _: Target())
+        self.assertIsInstance(test(Source()), Target)
+        self.assertEqual(calls, ["fail", "fail"])
+
+    def test_many_args(self):
+
+        @shield(*[int] * 10)
+        def test(*nums):
+            return nums
+
+        self.assertEqual(test(*[str(i) for i in range(10)]), tuple(range(10)))
+        self.assertEqual(test("1", "2"), (1, 2))
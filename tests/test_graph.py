@@ -4,7 +4,7 @@ import unittest
 import os, sys, itertools
 
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "target", "release"))
-from to import Conversions, ConversionError
+from to import Conversions, ConversionError, _fallback
 
 module = sys.modules[__name__]
 
@@ -31,8 +31,11 @@ def bad_transmuter(_):
 
 
 class TestGraph(unittest.TestCase):
+    conversions = Conversions
+    conversion_error = ConversionError
+
     def setUp(self):
-        self.conv = Conversions()
+        self.conv = self.conversions()
 
     def test_basic_graph(self):
         # A - B - C - D
@@ -52,6 +55,75 @@ class TestGraph(unittest.TestCase):
             "start -> AtoB -> BtoC -> CtoD",
         )
 
+    def test_bulk_graph(self):
+        # A - B - C
+
+        self.conv.add_conversions_bulk(
+            [
+                (1, TYPE_A, [], TYPE_B, [], AtoB()),
+                (1, TYPE_B, [], TYPE_C, [], BtoC()),
+            ]
+        )
+
+        self.assertEqual(
+            self.conv.convert("start", TYPE_C, [], TYPE_A),
+            "start -> AtoB -> BtoC",
+        )
+
+    def test_empty_variations(self):
+        # A - B
+
+        self.conv.add_conversion(1, TYPE_A, [], TYPE_B, [], AtoB())
+
+        for empty in (None, (), []):
+            self.assertEqual(
+                self.conv.convert("start", TYPE_B, empty, TYPE_A, empty),
+                "start -> AtoB",
+            )
+            self.assertEqual(len(self.conv.resolve(TYPE_A, TYPE_B, empty, empty)), 1)
+
+    def test_bulk_invalid(self):
+        # C - A   B
+
+        self.conv.add_conversion(1, TYPE_A, [], TYPE_B, [], AtoB())
+        self.conv.add_conversion(1, TYPE_C, [], TYPE_A, [], CtoA())
+
+        with self.assertRaises(TypeError):
+            self.conv.convert("start", TYPE_C, [], TYPE_A)
+
+        with self.assertRaises((TypeError, ValueError)):
+            self.conv.add_conversions_bulk(
+                [(1, TYPE_B, [], TYPE_C, [], BtoC()), (1, TYPE_A, [])]
+            )
+
+        # Nothing from the failed batch made it in
+        with self.assertRaises(TypeError):
+            self.conv.convert("start", TYPE_C, [], TYPE_A)
+
+        with self.assertRaises(TypeError):
+            self.conv.add_conversions_bulk(
+                [
+                    (1, TYPE_B, [], TYPE_C, [], BtoC()),
+                    ("1", TYPE_A, [], TYPE_B, [], AtoB()),
+                    (1, TYPE_C, [], TYPE_A, [], CtoA()),
+                ]
+            )
+        with self.assertRaises(TypeError):
+            self.conv.add_conversion("1", TYPE_B, [], TYPE_C, [], BtoC())
+
+        # Still nothing from the failed batch, and the graph still searches fine
+        with self.assertRaises(TypeError):
+            self.conv.convert("start", TYPE_C, [], TYPE_A)
+        self.assertEqual(
+            self.conv.convert("start", TYPE_B, [], TYPE_C), "start -> CtoA -> AtoB"
+        )
+
+        self.conv.add_conversions_bulk([(1, TYPE_B, [], TYPE_C, [], BtoC())])
+        self.assertEqual(
+            self.conv.convert("start", TYPE_C, [], TYPE_A),
+            "start -> AtoB -> BtoC",
+        )
+
     def test_revealer(self):
         # A - B - C
         #  \     /
@@ -153,6 +225,23 @@ class TestGraph(unittest.TestCase):
             "start -> AtoB -> BtoC -> CtoD:var -> DtoG -> GtoF -> FtoE -> EtoA",
         )
 
+    def test_same_type(self):
+
+        # A = B
+
+        self.conv.add_conversion(1, TYPE_A, [], TYPE_B, [], AtoB())
+        self.conv.add_conversion(1, TYPE_B, [], TYPE_A, ["var"], BtoA("var"))
+
+        self.assertEqual(self.conv.convert("start", TYPE_A, [], TYPE_A), "start")
+        self.assertEqual(
+            self.conv.convert("start", TYPE_A, ["var"], TYPE_A, ["var", "other"]),
+            "start",
+        )
+        self.assertEqual(
+            self.conv.convert("start", TYPE_A, ["var"], TYPE_A),
+            "start -> AtoB -> BtoA:var",
+        )
+
     def test_failures(self):
 
         # A - B
@@ -176,7 +265,7 @@ class TestGraph(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.conv.convert("start", TYPE_F, [], TYPE_E)
 
-        with self.assertRaises(ConversionError):
+        with self.assertRaises(self.conversion_error):
             self.conv.convert("start", TYPE_G, [], TYPE_F)
 
     def test_redirect(self):
@@ -195,6 +284,60 @@ class TestGraph(unittest.TestCase):
             "start -> AtoB -> BtoC",
         )
 
+    def test_resolve(self):
+        # A - B - C
+
+        a_to_b = AtoB()
+        b_to_c = BtoC()
+        self.conv.add_conversion(1, TYPE_A, [], TYPE_B, [], a_to_b)
+        self.conv.add_conversion(1, TYPE_B, [], TYPE_C, [], b_to_c)
+
+        chain = self.conv.resolve(TYPE_A, TYPE_C)
+        self.assertEqual(len(chain), 2)
+        self.assertIs(chain[0], a_to_b)
+        self.assertIs(chain[1], b_to_c)
+
+        self.assertEqual(self.conv.resolve(TYPE_A, TYPE_A), ())
+
+        with self.assertRaises(TypeError):
+            self.conv.resolve(TYPE_C, TYPE_A)
+
+        # Another route means the chain used depends on whether steps succeed
+        self.conv.add_conversion(5, TYPE_A, [], TYPE_C, [], AtoC())
+        self.assertIsNone(self.conv.resolve(TYPE_A, TYPE_C))
+
+        # Revealers depend on the value, so can't be resolved ahead of time
+        self.conv.add_revealer(TYPE_A, lambda _: iter(["var"]))
+        self.assertIsNone(self.conv.resolve(TYPE_A, TYPE_B))
+        self.assertEqual(len(self.conv.resolve(TYPE_A, TYPE_B, explicit=True)), 1)
+
+    def test_new_path(self):
+
+        # A - B - C
+        #  \     /
+        #   - D -
+
+        self.conv.add_conversion(3, TYPE_A, [], TYPE_B, [], AtoB())
+        self.conv.add_conversion(3, TYPE_B, [], TYPE_C, [], BtoC())
+
+        self.assertEqual(
+            self.conv.convert("start", TYPE_C, [], TYPE_A),
+            "start -> AtoB -> BtoC",
+        )
+
+        self.conv.add_conversion(1, TYPE_A, [], TYPE_D, [], AtoD())
+        self.conv.add_conversion(1, TYPE_D, [], TYPE_C, [], DtoC())
+
+        self.assertEqual(
+            self.conv.convert("start", TYPE_C, [], TYPE_A),
+            "start -> AtoD -> DtoC",
+        )
+
+
+class TestFallbackGraph(TestGraph):
+    conversions = _fallback.Conversions
+    conversion_error = _fallback.ConversionError
+
 
 if __name__ == "__main__":
     unittest.main()
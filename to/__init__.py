@@ -1,40 +1,221 @@
-from to._internal import Conversions, ConversionError
+import logging
+from functools import wraps
+
+try:
+    from to._internal import Conversions, ConversionError
+except ImportError:
+    from to._fallback import Conversions, ConversionError
 
 __all__ = ("to", "add_conversion", "add_revealer", "ConversionError", "Conversions")
 
 
 _GLOBAL_REGISTRY = Conversions()
 
+# Bound directly, rather than wrapped, so calls go straight into the registry
 to = _GLOBAL_REGISTRY.convert
-add_revealer = _GLOBAL_REGISTRY.add_revealer
-add_conversion = _GLOBAL_REGISTRY.add_conversion
+
+# Fused conversion functions. Keyed by the type wanted, then by the type had.
+_RESOLVED = {}
+_RESOLVED_SIZE = 1024
+
+# Generated shield wrapper factories, by number of arguments
+_WRAPPERS = {}
+_WRAPPERS_MAX = 8
+
+
+def add_revealer(type_in, function):
+    """
+    Supply a function to reveal variations on the global registry.
+    See "Conversions.add_revealer".
+    """
+    _GLOBAL_REGISTRY.add_revealer(type_in, function)
+    _clear_resolved()
+
+
+def add_conversion(cost, type_in, variations_in, type_out, variations_out, function):
+    """
+    Add a conversion to the global registry.
+    See "Conversions.add_conversion".
+    """
+    _GLOBAL_REGISTRY.add_conversion(
+        cost, type_in, variations_in, type_out, variations_out, function
+    )
+    _clear_resolved()
+
+
+def _clear_resolved():
+    # Cleared in place, as converters hold on to their own caches
+    for cache in _RESOLVED.values():
+        cache.clear()
 
 
 def shield(*types):
     def decorator(func):
-        from functools import wraps
+        return wraps(func)(_specialize(func, types))
+    return decorator
+
+
+def _specialize(func, types):
+    """
+    Build a wrapper tailored to the number of types being shielded,
+    so each argument is converted inline rather than mapped over.
+    """
+    caches = [_resolved(type_want) for type_want in types]
+    if len(types) > _WRAPPERS_MAX:
 
-        @wraps(func)
         def wrapper(*args, **kwargs):
-            return func(*map(to, args, types), **kwargs)
+            if len(args) != len(caches):
+                return func(*map(to, args, types), **kwargs)
+            return func(*[_convert(cache, arg) for cache, arg in zip(caches, args)], **kwargs)
         return wrapper
-    return decorator
+
+    try:
+        make_wrapper = _WRAPPERS[len(types)]
+    except KeyError:
+        make_wrapper = _WRAPPERS[len(types)] = _wrapper_factory(len(types))
+    return make_wrapper(func, types, *caches)
+
+
+def _wrapper_factory(size):
+    """
+    Generate a function producing wrappers that convert exactly this many arguments.
+    eg: size 1 wraps with "def wrapper(a0): f0 = r0[type(a0)]; return func(to(a0, t0) if f0 is None else f0(a0))"
+    """
+    names = ["a{}".format(i) for i in range(size)]
+    fused = ["f{}".format(i) for i in range(size)]
+    caches = ["r{}".format(i) for i in range(size)]
+    types = ["t{}".format(i) for i in range(size)]
+
+    source = "def make_wrapper({}):\n".format(", ".join(["func", "types"] + caches))
+    if names:
+        source += "    {}, = types\n".format(", ".join(types))
+    source += "    def wrapper(*args, **kwargs):\n"
+    source += "        if len(args) != {}:\n".format(size)
+    source += "            return func(*map(to, args, types), **kwargs)\n"
+    if names:
+        source += "        {}, = args\n".format(", ".join(names))
+    for function, cache, name in zip(fused, caches, names):
+        source += "        {} = {}[type({})]\n".format(function, cache, name)
+    source += "        return func({}**kwargs)\n".format(
+        "".join(
+            "to({1}, {2}) if {0} is None else {0}({1}), ".format(function, name, type_want)
+            for function, name, type_want in zip(fused, names, types)
+        )
+    )
+    source += "    return wrapper\n"
+
+    namespace = {"to": to}
+    exec(source, namespace)
+    return namespace["make_wrapper"]
+
+
+class _Resolved(dict):
+    """
+    Fused conversions into one type, keyed by the type had.
+    Filled in on first lookup, with None where there is nothing to fuse.
+    """
+
+    def __init__(self, type_want):
+        super(_Resolved, self).__init__()
+        self.type_want = type_want
+
+    def __missing__(self, type_have):
+        if len(self) >= _RESOLVED_SIZE:
+            self.clear()
+        fused = self[type_have] = _resolve(type_have, self.type_want)
+        return fused
+
+
+def _resolved(type_want):
+    try:
+        return _RESOLVED[type_want]
+    except KeyError:
+        cache = _RESOLVED[type_want] = _Resolved(type_want)
+        return cache
+
+
+def _convert(cache, value):
+    fused = cache[type(value)]
+    return to(value, cache.type_want) if fused is None else fused(value)
+
+
+def _resolve(type_have, type_want):
+    """
+    Get a single function running the whole chain of conversions between two types.
+    Only chains that are the one and only route get fused, which in practice means
+    user conversions into types nothing else reaches. The builtin types all convert
+    into each other, so builtin pairs always have other routes and are never fused.
+    None if there are other routes, if the chain depends on the value itself (revealers),
+    or if there is no chain at all.
+    """
+    try:
+        chain = _GLOBAL_REGISTRY.resolve(type_have, type_want)
+    except TypeError:
+        return None
+    return None if chain is None else _fuse(chain)
+
+
+def _fuse(chain):
+    """
+    Compose a chain of functions into one, so running it is a single call.
+    eg: (f0, f1, f2) becomes "def fused(v): return f2(f1(f0(v)))"
+    The chain is the only route, so there is nothing to retry should it fail.
+    Failures are reported the same way the full conversion would.
+    """
+    call = "v"
+    for i in range(len(chain)):
+        call = "f{}({})".format(i, call)
+    namespace = {"f{}".format(i): function for i, function in enumerate(chain)}
+    namespace["fail"] = _fail
+    exec(
+        "def fused(v):\n"
+        "    try:\n"
+        "        return {}\n"
+        "    except Exception as err:\n"
+        "        fail(err)\n".format(call),
+        namespace,
+    )
+    return namespace["fused"]
+
+
+def _fail(err):
+    message = "{}: {}".format(type(err).__name__, err)
+    logging.getLogger("to").warning(message)
+    raise ConversionError(
+        "Some problems occurred during the conversion process:\n{}".format(message)
+    )
+
+
+# Cost, type in, type out, function
+_BUILTIN_EDGES = (
+    (1, str, int, int),
+    (1, str, float, float),
+    (1, str, bool, bool),
+    (1, int, str, str),
+    (1, int, float, float),
+    (1, int, bool, bool),
+    (1, float, str, str),
+    (1, float, int, int),
+    (1, float, bool, bool),
+    (1, bool, str, str),
+    (1, bool, int, int),
+    (1, bool, float, float),
+)
 
 
 def _initialize_builtins():
     """
     Initialize some basic conversions between built in types
     """
-    from itertools import permutations
-
-    for source, target in permutations((str, int, float, bool), 2):
-        add_conversion(1, source, (), target, (), target)
+    _GLOBAL_REGISTRY.add_conversions_bulk(
+        [(cost, source, (), target, (), func) for cost, source, target, func in _BUILTIN_EDGES]
+    )
 
     # TODO: Consider support for more generic types. So conversions can happen
     # within container types. eg convert List[str] to List[int]
 
 _initialize_builtins()
-del _initialize_builtins
+del _initialize_builtins, _BUILTIN_EDGES
 
 
 
@@ -0,0 +1,432 @@
+"""
+Pure python implementation of the conversion graph.
+Used when the compiled "_internal" module is not available. Same interface, but slower.
+The compiled search works from both ends and takes the first route where they meet, while this
+one searches forward only. Both find working routes, but where several exist they may pick differently.
+"""
+
+import heapq
+import logging
+from collections import namedtuple
+from itertools import count
+from numbers import Integral
+
+__all__ = ("Conversions", "ConversionError")
+
+LOG = logging.getLogger("to")
+
+# Upper bound on the number of remembered search results before the cache is flushed.
+PATH_CACHE_SIZE = 1024
+
+# Number of times a conversion is attempted, skipping failed steps, before giving up.
+ATTEMPTS = 10
+
+EMPTY = frozenset()
+
+
+class ConversionError(Exception):
+    """ Triggered when errors occurred during conversion process """
+
+
+# Types are referred to by small integer ids (keys) internally.
+# Variations each get a bit, and sets of them are stored as a bitmask.
+Edge = namedtuple(
+    "Edge",
+    (
+        "cost",
+        "key_in",
+        "variations_in",
+        "key_out",
+        "variations_out",
+        "function",
+        "consumes",
+        "adds",
+    ),
+)
+
+
+def _check_cost(cost):
+    # The compiled module only accepts integer costs
+    if not isinstance(cost, Integral):
+        raise TypeError("Expected an integer cost, got {!r}".format(cost))
+
+
+class Conversions(object):
+    """
+    Simple plugin based A to B function chaining.
+    See the compiled "_internal" module for full documentation.
+    """
+
+    def __init__(self):
+        self._type_ids = {}
+        self._variation_bits = {}
+        # Edges leaving and entering each type, indexed by key
+        self._edges = []
+        self._edges_reversed = []
+        self._min_cost = float("inf")
+        # Revealers for each type, indexed by key
+        self._revealers = []
+        # Results of previous searches. Flushed whenever the graph changes.
+        self._paths = {}
+        # Distances toward each type we have been asked to convert to.
+        # Only dropped when a new edge could shorten them.
+        self._landmarks = {}
+
+    def add_conversion(
+        self, cost, type_in, variations_in, type_out, variations_out, function
+    ):
+        """
+        Add a function so it may be used as a step in the composition process later.
+        """
+        _check_cost(cost)
+        self._insert_edge(
+            cost, type_in, variations_in, type_out, variations_out, function
+        )
+        # New edges could open up cheaper paths
+        self._paths.clear()
+
+    def add_conversions_bulk(self, conversions):
+        """
+        Add a number of conversions in one go. Equivalent to calling "add_conversion" for each.
+        Nothing is added unless every conversion is valid.
+        """
+        checked = []
+        for conversion in conversions:
+            if not isinstance(conversion, tuple) or len(conversion) != 6:
+                raise TypeError(
+                    "Expected a tuple of 6 values for each conversion, got {!r}".format(
+                        conversion
+                    )
+                )
+            cost, type_in, variations_in, type_out, variations_out, function = conversion
+            # Anything invalid should fail here, before the graph is touched
+            _check_cost(cost)
+            hash((type_in, type_out, function))
+            checked.append(
+                (
+                    cost,
+                    type_in,
+                    frozenset(variations_in),
+                    type_out,
+                    frozenset(variations_out),
+                    function,
+                )
+            )
+
+        try:
+            for conversion in checked:
+                self._insert_edge(*conversion)
+        finally:
+            self._paths.clear()
+
+    def add_revealer(self, type_in, function):
+        """
+        Supply a function that will attempt to reveal insights into the provided data as variations.
+        """
+        self._revealers[self._type_key(type_in)].append(function)
+
+    def convert(
+        self,
+        value,
+        type_want,
+        variations_want=(),
+        type_have=None,
+        variations_have=(),
+        explicit=False,
+        debug=False,
+    ):
+        """
+        From a given type, attempt to produce a requested type.
+        """
+        if type_have is None:
+            type_have = type(value)
+        variations_want = frozenset(variations_want) if variations_want else EMPTY
+        variations_have = frozenset(variations_have) if variations_have else EMPTY
+
+        # Short circut if we already have what we want
+        if type_have == type_want and variations_want <= variations_have:
+            return value
+
+        # Look the types up once. Used for revealers and the search.
+        key_in = self._type_ids.get(type_have)
+        key_out = self._type_ids.get(type_want)
+
+        if not explicit and key_in is not None:
+            # We don't want to be explicit, so
+            # run the activator to detect initial variations
+            revealers = self._revealers[key_in]
+            if revealers:
+                revealed = set(variations_have)
+                for revealer in revealers:
+                    revealed.update(revealer(value))
+                variations_have = frozenset(revealed)
+
+        # Retry a few times, if something breaks along the way.
+        skip_edges = EMPTY
+        errors = []
+        for _ in range(ATTEMPTS):
+            edges = self._search(
+                key_in, variations_have, key_out, variations_want, skip_edges
+            )
+            if edges is None:
+                break
+            result = value
+            for edge in edges:
+                if debug:
+                    LOG.warning("{}({}) -> ...".format(edge.function, result))
+                try:
+                    result = edge.function(result)
+                except Exception as err:
+                    message = "{}: {}".format(type(err).__name__, err)
+                    LOG.warning(message)
+                    errors.append(message)
+                    # Ignore these when trying again.
+                    skip_edges = skip_edges.union((edge,))
+                    break
+                if debug:
+                    LOG.warning("... -> {}".format(result))
+            else:
+                return result
+
+        if errors:
+            raise ConversionError(
+                "Some problems occurred during the conversion process:\n{}".format(
+                    "\n".join(errors)
+                )
+            )
+        raise TypeError(
+            "Could not convert {} to {}. Perhaps some conversion steps are missing.".format(
+                value, type_want
+            )
+        )
+
+    def resolve(
+        self,
+        type_have,
+        type_want,
+        variations_want=(),
+        variations_have=(),
+        explicit=False,
+    ):
+        """
+        Find the chain of functions that would convert one type into another, without running them.
+        Returns None if revealers are needed to make the decision (unless explicit),
+        or if other routes would be tried should a step in the chain fail.
+        """
+        variations_want = frozenset(variations_want) if variations_want else EMPTY
+        variations_have = frozenset(variations_have) if variations_have else EMPTY
+
+        key_in = self._type_ids.get(type_have)
+        key_out = self._type_ids.get(type_want)
+
+        if not explicit and key_in is not None and self._revealers[key_in]:
+            return None
+
+        # Nothing to do if we already have what we want
+        if type_have == type_want and variations_want <= variations_have:
+            return ()
+
+        edges = self._search(
+            key_in, variations_have, key_out, variations_want, EMPTY
+        )
+        if edges is None:
+            raise TypeError(
+                "Could not convert {} to {}. Perhaps some conversion steps are missing.".format(
+                    type_have, type_want
+                )
+            )
+
+        # Check for other routes, were any one step to fail
+        for edge in edges:
+            if self._search(
+                key_in, variations_have, key_out, variations_want, frozenset((edge,))
+            ) is not None:
+                return None
+        return tuple(edge.function for edge in edges)
+
+    def _insert_edge(
+        self, cost, type_in, variations_in, type_out, variations_out, function
+    ):
+        key_in = self._type_key(type_in)
+        key_out = self._type_key(type_out)
+        mask_in = self._variation_mask(variations_in)
+        mask_out = self._variation_mask(variations_out)
+        edge = Edge(
+            cost,
+            key_in,
+            mask_in,
+            key_out,
+            mask_out,
+            function,
+            bin(mask_in).count("1"),
+            bin(mask_out).count("1"),
+        )
+        self._min_cost = min(self._min_cost, cost)
+        self._edges[key_in].append(edge)
+        self._edges_reversed[key_out].append(edge)
+
+        for key_want, distances in list(self._landmarks.items()):
+            remaining = distances.get(key_out)
+            if remaining is None:
+                continue
+            if cost + remaining < distances.get(key_in, cost + remaining + 1):
+                del self._landmarks[key_want]
+
+    def _type_key(self, type_):
+        key = self._type_ids.get(type_)
+        if key is None:
+            key = self._type_ids[type_] = len(self._type_ids)
+            self._edges.append([])
+            self._edges_reversed.append([])
+            self._revealers.append([])
+        return key
+
+    def _variation_mask(self, variations):
+        mask = 0
+        for variation in variations:
+            bit = self._variation_bits.get(variation)
+            if bit is None:
+                bit = self._variation_bits[variation] = 1 << len(self._variation_bits)
+            mask |= bit
+        return mask
+
+    def _search(self, key_in, variations_have, key_out, variations_want, skip_edges):
+        # Swap variations for their bits up front, so the search only deals in integers.
+        # Anything never registered cannot be part of a path.
+        if key_in is None or key_out is None:
+            return None
+
+        # Variations no conversion knows about are never consumed, only carried along.
+        # So they either satisfy themselves, or can never be satisfied.
+        bits = self._variation_bits
+        if any(var not in bits and var not in variations_have for var in variations_want):
+            return None
+        variations_in = variations_out = 0
+        for var in variations_have:
+            variations_in |= bits.get(var, 0)
+        for var in variations_want:
+            variations_out |= bits.get(var, 0)
+
+        # Only remember clean searches. Searches skipping edges are retries
+        # after a failure, and are specific to that one conversion.
+        if skip_edges:
+            return self._search_uncached(
+                key_in, variations_in, key_out, variations_out, skip_edges
+            )
+
+        path_key = (key_in, variations_in, key_out, variations_out)
+        try:
+            return self._paths[path_key]
+        except KeyError:
+            pass
+
+        path = self._search_uncached(
+            key_in, variations_in, key_out, variations_out, skip_edges
+        )
+        if len(self._paths) >= PATH_CACHE_SIZE:
+            self._paths.clear()
+        self._paths[path_key] = path
+        return path
+
+    def _distances(self, key_out):
+        """
+        Cheapest cost from every type that can reach the type we want, ignoring variations.
+        Variations only ever restrict which edges can be taken, so this never overestimates.
+        """
+        try:
+            return self._landmarks[key_out]
+        except KeyError:
+            pass
+
+        distances = {key_out: 0}
+        queue = [(0, key_out)]
+        while queue:
+            cost, key = heapq.heappop(queue)
+            if cost > distances[key]:
+                continue
+            for edge in self._edges_reversed[key]:
+                distance = cost + edge.cost
+                if distance < distances.get(edge.key_in, distance + 1):
+                    distances[edge.key_in] = distance
+                    heapq.heappush(queue, (distance, edge.key_in))
+        self._landmarks[key_out] = distances
+        return distances
+
+    def _search_uncached(
+        self, key_in, variations_in, key_out, variations_out, skip_edges
+    ):
+        """
+        Look for the cheapest path between converters (edges)
+        A chain of types must match. eg A>B  B>C C>D
+        Variations are like dependencies on input. They are required
+        to satisfy that edges traversal. A type can be visited again
+        later when it carries a different set of variations.
+
+        The search works backward from the type we want first (ignoring variations),
+        then uses those distances to guide the search forward (A*). Types that
+        cannot reach the goal at all are never explored.
+        """
+        # Estimates are only sound without negative costs.
+        distances = self._distances(key_out) if self._min_cost >= 0 else None
+        if distances is not None and key_in not in distances:
+            return None
+
+        # Queue entries: estimated total cost, variations consumed, variations added (both negated,
+        # so more specific paths win ties), tiebreak, cost, key, variations, path (edge, parent)
+        tiebreak = count()
+        queue = [(0, 0, 0, next(tiebreak), 0, key_in, variations_in, None)]
+        visited = set()
+
+        while queue:
+            _, consumed, added, _, cost, key, variations, path = heapq.heappop(queue)
+
+            # Check if we have reached our goal and variations are all met
+            if (
+                path is not None
+                and key == key_out
+                and variations & variations_out == variations_out
+            ):
+                edges = []
+                while path is not None:
+                    edge, path = path
+                    edges.append(edge)
+                edges.reverse()
+                return edges
+
+            if (key, variations) in visited:
+                continue
+            visited.add((key, variations))
+
+            for edge in self._edges[key]:
+                if edge in skip_edges:
+                    continue
+                # Variation dependency check
+                if variations & edge.variations_in != edge.variations_in:
+                    continue
+
+                new_cost = cost + edge.cost
+                new_variations = (variations & ~edge.variations_in) | edge.variations_out
+                estimate = new_cost
+                if distances is not None:
+                    remaining = distances.get(edge.key_out)
+                    if remaining is None:
+                        continue
+                    # Missing variations need at least one more step
+                    if new_variations & variations_out != variations_out:
+                        remaining = max(remaining, self._min_cost)
+                    estimate += remaining
+
+                heapq.heappush(
+                    queue,
+                    (
+                        estimate,
+                        consumed - edge.consumes,
+                        added - edge.adds,
+                        next(tiebreak),
+                        new_cost,
+                        edge.key_out,
+                        new_variations,
+                        (edge, path),
+                    ),
+                )
+        return None
@@ -2,9 +2,11 @@ from typing import (
     Any,
     Callable,
     Hashable,
+    Iterable,
     Iterator,
     Optional,
     Sequence,
+    Tuple,
     Type,
     TypeVar,
 )
@@ -27,6 +29,21 @@ class Conversions:
     ) -> None:
         ...
 
+    def add_conversions_bulk(
+        self,
+        conversions: Iterable[
+            Tuple[
+                int,
+                Type[Any],
+                Sequence[Hashable],
+                Type[Any],
+                Sequence[Hashable],
+                Callable[[Any], Any],
+            ]
+        ],
+    ) -> None:
+        ...
+
     def add_revealer(
         self,
         type_in: Type[A],
@@ -45,3 +62,13 @@ class Conversions:
         debug: bool = False,
     ) -> B:
         ...
+
+    def resolve(
+        self,
+        type_have: Type[A],
+        type_want: Type[B],
+        variations_want: Optional[Sequence[Hashable]] = None,
+        variations_have: Optional[Sequence[Hashable]] = None,
+        explicit: bool = False,
+    ) -> Optional[Tuple[Callable[[Any], Any], ...]]:
+        ...